@@ -0,0 +1,635 @@
+"""DocMint HTTP API.
+
+Machine-friendly entry point for the DocMint tools, served next to the
+Streamlit UI. Every tool is one ``POST /<tool>`` endpoint: the raw file is
+sent as the request body, options go in the query string, and the result is
+streamed back as the response body.
+
+    python api.py --port 8000
+    curl --data-binary @photo.jpg "http://localhost:8000/compress?target_kb=200" -o out.jpg
+    curl --data-binary @docs.zip  "http://localhost:8000/merge" -o merged.pdf
+
+Request bodies are spooled to temp files in chunks and responses are sent
+from temp files in chunks, so large uploads never sit in memory twice.
+``GET /healthz`` and ``GET /metrics`` are provided for load balancers and
+Prometheus scraping.
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import socket
+import zipfile
+import zlib
+import tempfile
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+
+from docmint_tools import (
+    HAS_CV2, HAS_MEDIAPIPE, HAS_PDF2DOCX, HAS_PDF2IMAGE, BLUR_MODES,
+    output_format, save_image, compress_image, resize_image, upscale_image, rotate_image,
+    convert_image, load_rgb_array, blur_image, remove_background,
+    merge_pdfs, split_pdf, pdf_to_docx, pdf_to_jpgs,
+)
+from jpg_to_pdf import images_to_pdf, UnreadableImageError, PAGE_SIZES, FIT_MODES, ORIENTATIONS
+
+# --- CONFIGURATION ---
+
+DEFAULT_HOST = os.environ.get("DOCMINT_API_HOST", "0.0.0.0")
+DEFAULT_PORT = int(os.environ.get("DOCMINT_API_PORT", "8000"))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("DOCMINT_API_MAX_CONCURRENCY", str(os.cpu_count() or 2)))
+DEFAULT_MAX_UPLOAD_MB = int(os.environ.get("DOCMINT_API_MAX_UPLOAD_MB", "200"))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("DOCMINT_API_READ_TIMEOUT", "30"))
+DEFAULT_UPLOAD_DEADLINE = float(os.environ.get("DOCMINT_API_UPLOAD_DEADLINE", "300"))
+
+CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff", ".bmp", ".gif")
+
+
+class ApiError(Exception):
+    """Error that maps directly to an HTTP status for the client."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- HELPERS ---
+
+def _spool_path(workdir, name):
+    return os.path.join(workdir, name)
+
+def _open_image(path):
+    try:
+        img = Image.open(path)
+        img.load()
+        return img
+    except Image.DecompressionBombError:
+        raise ApiError(400, "Image dimensions exceed the processing limit.")
+    except (OSError, ValueError):
+        raise ApiError(415, "Request body is not a readable image.")
+
+def _check_output_pixels(w, h):
+    # Same bound Pillow applies to decoding, so outputs can't outgrow inputs' limit
+    if Image.MAX_IMAGE_PIXELS and w * h > Image.MAX_IMAGE_PIXELS:
+        raise ApiError(400, f"Output of {w}x{h} px exceeds the processing limit.")
+
+def _open_pdf(path, what="Request body"):
+    # Parse up front so broken or encrypted uploads are the client's error, not a 500
+    try:
+        reader = PdfReader(path)
+        if reader.is_encrypted:
+            raise ApiError(415, f"{what} is an encrypted PDF.")
+        len(reader.pages)
+        return reader
+    except (PdfReadError, ValueError, KeyError):
+        raise ApiError(415, f"{what} is not a readable PDF.")
+
+def _read_rgb(path):
+    rgb = load_rgb_array(path)
+    if rgb is None:
+        raise ApiError(415, "Request body is not a readable image.")
+    return rgb
+
+def _int_param(params, name, default=None, lo=None, hi=None):
+    raw = params.get(name, [None])[0]
+    if raw is None or raw == "":
+        if default is None:
+            raise ApiError(400, f"Missing query parameter '{name}'.")
+        return default
+    try:
+        val = int(raw)
+    except ValueError:
+        raise ApiError(400, f"Query parameter '{name}' must be an integer.")
+    if (lo is not None and val < lo) or (hi is not None and val > hi):
+        raise ApiError(400, f"Query parameter '{name}' must be between {lo} and {hi}.")
+    return val
+
+def _str_param(params, name, choices, default):
+    val = params.get(name, [default])[0]
+    if val not in choices:
+        raise ApiError(400, f"Query parameter '{name}' must be one of: {', '.join(choices)}.")
+    return val
+
+def _zip_members(zf, extensions, max_bytes):
+    # Skip folders and macOS Finder metadata (__MACOSX/, ._*, .DS_Store)
+    names = []
+    total = 0
+    for info in zf.infolist():
+        name = info.filename
+        base = name.rsplit("/", 1)[-1]
+        if info.is_dir() or name.startswith("__MACOSX/") or base.startswith("."):
+            continue
+        if base.lower().endswith(extensions):
+            # Declared sizes cap the unpacked total; _extract_member enforces them
+            total += info.file_size
+            if total > max_bytes:
+                raise ApiError(413, "ZIP archive unpacks to more than the upload limit.")
+            names.append(name)
+    return sorted(names)
+
+def _extract_member(zf, name, dest):
+    # Copy at most the size the header declares, so a lying header can't fill the disk
+    remaining = zf.getinfo(name).file_size
+    try:
+        with zf.open(name) as s, open(dest, "wb") as d:
+            while True:
+                buf = s.read(min(CHUNK_SIZE, remaining + 1))
+                if not buf:
+                    break
+                remaining -= len(buf)
+                if remaining < 0:
+                    raise ApiError(415, f"'{name}' is larger than its ZIP header declares.")
+                d.write(buf)
+    except (zipfile.BadZipFile, zlib.error, EOFError):
+        raise ApiError(415, f"'{name}' is corrupt in the ZIP archive.")
+
+def _zip_dir_entries(entries, out_path):
+    # entries: iterable of (arcname, filesystem path); written file-by-file
+    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for arcname, path in entries:
+            zf.write(path, arcname)
+
+# --- TOOLS ---
+# Each tool takes (input path, query params, work dir, byte limit for anything
+# it unpacks) and returns (output path, content type, download filename).
+
+def api_compress_image(src, params, workdir, max_bytes):
+    target_kb = _int_param(params, "target_kb", lo=1)
+    img = _open_image(src)
+    out = _spool_path(workdir, "compressed.jpg")
+    with open(out, "w+b") as f:
+        compress_image(img, target_kb * 1024, f)
+    return out, "image/jpeg", "compressed.jpg"
+
+def api_resize_image(src, params, workdir, max_bytes):
+    img = _open_image(src)
+    if "pct" in params:
+        pct = _int_param(params, "pct", lo=1, hi=1000)
+        w, h = int(img.width * pct / 100), int(img.height * pct / 100)
+    else:
+        w = _int_param(params, "width", lo=1, hi=20000)
+        h = _int_param(params, "height", lo=1, hi=20000)
+    _check_output_pixels(w, h)
+
+    fmt = output_format(img)
+    out = _spool_path(workdir, f"resized.{fmt.lower()}")
+    save_image(resize_image(img, w, h), out, fmt)
+    return out, f"image/{fmt.lower()}", f"resized.{fmt.lower()}"
+
+def api_upscale_image(src, params, workdir, max_bytes):
+    factor = _int_param(params, "factor", default=2, lo=2, hi=4)
+    img = _open_image(src)
+    _check_output_pixels(img.width * factor, img.height * factor)
+    fmt = output_format(img)
+    out = _spool_path(workdir, f"upscaled_{factor}x.{fmt.lower()}")
+    save_image(upscale_image(img, factor), out, fmt)
+    return out, f"image/{fmt.lower()}", f"upscaled_{factor}x.{fmt.lower()}"
+
+def api_rotate_image(src, params, workdir, max_bytes):
+    angle = _int_param(params, "angle", lo=-360, hi=360)
+    img = _open_image(src)
+    # expand=True grows the canvas to the rotated bounding box
+    rad = math.radians(angle)
+    cos, sin = abs(math.cos(rad)), abs(math.sin(rad))
+    _check_output_pixels(math.ceil(img.width * cos + img.height * sin),
+                         math.ceil(img.width * sin + img.height * cos))
+    out = _spool_path(workdir, "rotated.png")
+    rotate_image(img, angle).save(out, format="PNG")
+    return out, "image/png", "rotated.png"
+
+def api_convert_to_jpg(src, params, workdir, max_bytes):
+    out = _spool_path(workdir, "conv.jpeg")
+    convert_image(_open_image(src), out, "JPEG")
+    return out, "image/jpeg", "conv.jpeg"
+
+def api_blur(src, params, workdir, max_bytes):
+    if not HAS_CV2:
+        raise ApiError(501, "OpenCV (`opencv-python-headless`) is required.")
+    mode = _str_param(params, "mode", BLUR_MODES, "face")
+    rgb, _ = blur_image(_read_rgb(src), mode)
+    out = _spool_path(workdir, "blurred.jpg")
+    Image.fromarray(rgb).save(out, format="JPEG")
+    return out, "image/jpeg", "blurred.jpg"
+
+def api_remove_bg(src, params, workdir, max_bytes):
+    if not (HAS_CV2 and HAS_MEDIAPIPE):
+        raise ApiError(501, "Libraries `mediapipe` and `opencv-python-headless` are required.")
+    out = _spool_path(workdir, "no_bg_mp.png")
+    remove_background(_read_rgb(src)).save(out, format="PNG")
+    return out, "image/png", "no_bg_mp.png"
+
+def api_merge_pdf(src, params, workdir, max_bytes):
+    # Multiple inputs arrive as one ZIP; PDFs are merged in filename order
+    try:
+        zf = zipfile.ZipFile(src)
+    except zipfile.BadZipFile:
+        raise ApiError(415, "Merge expects a ZIP archive of PDF files as the request body.")
+
+    with zf:
+        names = _zip_members(zf, (".pdf",), max_bytes)
+        if not names:
+            raise ApiError(400, "ZIP archive contains no PDF files.")
+        indir = _spool_path(workdir, "merge_in")
+        os.makedirs(indir)
+        readers = []
+        for i, name in enumerate(names):
+            part = os.path.join(indir, f"{i:05d}.pdf")
+            _extract_member(zf, name, part)
+            readers.append(_open_pdf(part, f"'{name}'"))
+
+    out = _spool_path(workdir, "merged.pdf")
+    with open(out, "wb") as o:
+        merge_pdfs(readers, o)
+    return out, "application/pdf", "merged.pdf"
+
+def api_split_pdf(src, params, workdir, max_bytes):
+    pagedir = _spool_path(workdir, "pages")
+    os.makedirs(pagedir)
+    entries = []
+    for name, w in split_pdf(_open_pdf(src)):
+        path = os.path.join(pagedir, name)
+        with open(path, "wb") as o:
+            w.write(o)
+        entries.append((name, path))
+
+    out = _spool_path(workdir, "split.zip")
+    _zip_dir_entries(entries, out)
+    return out, "application/zip", "split.zip"
+
+def api_pdf_to_jpg(src, params, workdir, max_bytes):
+    if not HAS_PDF2IMAGE:
+        raise ApiError(501, "Install `pdf2image` + Poppler.")
+    dpi = _int_param(params, "dpi", default=200, lo=36, hi=600)
+    _open_pdf(src)
+    pagedir = _spool_path(workdir, "pages")
+    os.makedirs(pagedir)
+    paths = pdf_to_jpgs(src, pagedir, dpi=dpi)
+
+    out = _spool_path(workdir, "pages.zip")
+    _zip_dir_entries(((f"page_{i+1}.jpg", p) for i, p in enumerate(paths)), out)
+    return out, "application/zip", "pages.zip"
+
+def api_pdf_to_word(src, params, workdir, max_bytes):
+    if not HAS_PDF2DOCX:
+        raise ApiError(501, "Install `pdf2docx`")
+    _open_pdf(src)
+    pdf_path = _spool_path(workdir, "in.pdf")
+    os.rename(src, pdf_path)
+    out = _spool_path(workdir, "conv.docx")
+    pdf_to_docx(pdf_path, out)
+    return out, "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "conv.docx"
+
+def api_jpg_to_pdf(src, params, workdir, max_bytes):
+    page_size = _str_param(params, "page_size", list(PAGE_SIZES), "A4")
+    fit = _str_param(params, "fit", FIT_MODES, "fit")
+    orientation = _str_param(params, "orientation", ORIENTATIONS, "auto")
+    margin = _int_param(params, "margin", default=0, lo=0, hi=200)
+    max_px = _int_param(params, "max_px", default=0, lo=0, hi=20000)
+
+    out = _spool_path(workdir, "images.pdf")
+    options = dict(page_size=page_size, fit=fit, orientation=orientation,
+                   margin=margin, max_px=max_px or None)
+    try:
+        # One image as the body, or a ZIP of images added in filename order
+        if zipfile.is_zipfile(src):
+            with zipfile.ZipFile(src) as zf:
+                names = _zip_members(zf, IMAGE_EXTENSIONS, max_bytes)
+                if not names:
+                    raise ApiError(400, "ZIP archive contains no images.")
+                part = _spool_path(workdir, "image")
+
+                def sources():
+                    # Members are extracted one at a time into the same file
+                    for name in names:
+                        _extract_member(zf, name, part)
+                        yield part
+
+                with open(out, "wb") as o:
+                    images_to_pdf(sources(), o, **options)
+        else:
+            with open(out, "wb") as o:
+                images_to_pdf([src], o, **options)
+    except Image.DecompressionBombError:
+        raise ApiError(400, "Image dimensions exceed the processing limit.")
+    except UnreadableImageError:
+        raise ApiError(415, "Request body contains a file that is not a readable image.")
+    return out, "application/pdf", "images.pdf"
+
+# --- ROUTING ---
+
+TOOLS = {
+    "/compress": api_compress_image,
+    "/resize": api_resize_image,
+    "/upscale": api_upscale_image,
+    "/rotate": api_rotate_image,
+    "/convert-to-jpg": api_convert_to_jpg,
+    "/jpg-to-pdf": api_jpg_to_pdf,
+    "/blur": api_blur,
+    "/remove-bg": api_remove_bg,
+    "/merge": api_merge_pdf,
+    "/split": api_split_pdf,
+    "/pdf-to-jpg": api_pdf_to_jpg,
+    "/pdf-to-word": api_pdf_to_word,
+}
+
+# --- METRICS ---
+
+class Metrics:
+    """Thread-safe counters rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}    # (path, status) -> count
+        self.seconds = {}     # path -> total processing seconds
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def observe(self, path, status, seconds, bytes_in=0, bytes_out=0):
+        with self._lock:
+            key = (path, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.seconds[path] = self.seconds.get(path, 0.0) + seconds
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def add_in_flight(self, delta):
+        with self._lock:
+            self.in_flight += delta
+
+    def add_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def render(self, max_concurrency):
+        with self._lock:
+            lines = [
+                "# TYPE docmint_requests_total counter",
+                *(f'docmint_requests_total{{path="{p}",status="{s}"}} {n}'
+                  for (p, s), n in sorted(self.requests.items())),
+                "# TYPE docmint_request_seconds_total counter",
+                *(f'docmint_request_seconds_total{{path="{p}"}} {t:.6f}'
+                  for p, t in sorted(self.seconds.items())),
+                "# TYPE docmint_bytes_received_total counter",
+                f"docmint_bytes_received_total {self.bytes_in}",
+                "# TYPE docmint_bytes_sent_total counter",
+                f"docmint_bytes_sent_total {self.bytes_out}",
+                "# TYPE docmint_rejected_total counter",
+                f"docmint_rejected_total {self.rejected}",
+                "# TYPE docmint_in_flight gauge",
+                f"docmint_in_flight {self.in_flight}",
+                "# TYPE docmint_max_concurrency gauge",
+                f"docmint_max_concurrency {max_concurrency}",
+            ]
+        return "\n".join(lines) + "\n"
+
+# --- SERVER ---
+
+class DocMintHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DocMintAPI/1.0"
+
+    def setup(self):
+        # Socket timeout so a stalled client can't hold its thread forever
+        self.timeout = self.server.read_timeout
+        super().setup()
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write("%s - %s\n" % (self.address_string(), fmt % args))
+
+    def _send_bytes(self, status, body, content_type):
+        self._headers_sent = True
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def _send_json(self, status, payload):
+        return self._send_bytes(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send_file(self, path, content_type, filename):
+        size = os.path.getsize(path)
+        self._headers_sent = True
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(size))
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        self.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+        return size
+
+    def _read(self, size, deadline):
+        if time.monotonic() > deadline:
+            raise ApiError(408, "Request body not received in time.")
+        try:
+            return self.rfile.read(size)
+        except socket.timeout:
+            raise ApiError(408, "Request body not received in time.")
+
+    def _readline(self, deadline):
+        if time.monotonic() > deadline:
+            raise ApiError(408, "Request body not received in time.")
+        try:
+            return self.rfile.readline(1024)
+        except socket.timeout:
+            raise ApiError(408, "Request body not received in time.")
+
+    def _receive_body(self, dest):
+        # Stream the request body to disk; supports Content-Length and chunked uploads
+        limit = self.server.max_upload_bytes
+        deadline = time.monotonic() + self.server.upload_deadline
+        total = 0
+        with open(dest, "wb") as out:
+            if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+                while True:
+                    size_line = self._readline(deadline).split(b";", 1)[0].strip()
+                    try:
+                        size = int(size_line, 16)
+                    except ValueError:
+                        raise ApiError(400, "Malformed chunked request body.")
+                    if size < 0:
+                        raise ApiError(400, "Malformed chunked request body.")
+                    if size == 0:
+                        # Discard trailers up to the terminating blank line
+                        while self._readline(deadline) not in (b"\r\n", b"\n", b""):
+                            pass
+                        break
+                    total += size
+                    if total > limit:
+                        raise ApiError(413, "Request body too large.")
+                    remaining = size
+                    while remaining:
+                        buf = self._read(min(CHUNK_SIZE, remaining), deadline)
+                        if not buf:
+                            raise ApiError(400, "Truncated request body.")
+                        out.write(buf)
+                        remaining -= len(buf)
+                    self._readline(deadline)
+            else:
+                length = self.headers.get("Content-Length")
+                if length is None:
+                    raise ApiError(411, "Content-Length or chunked Transfer-Encoding is required.")
+                try:
+                    remaining = int(length)
+                except ValueError:
+                    raise ApiError(400, "Invalid Content-Length.")
+                if remaining < 0:
+                    raise ApiError(400, "Invalid Content-Length.")
+                if remaining > limit:
+                    raise ApiError(413, "Request body too large.")
+                while remaining:
+                    buf = self._read(min(CHUNK_SIZE, remaining), deadline)
+                    if not buf:
+                        raise ApiError(400, "Truncated request body.")
+                    out.write(buf)
+                    remaining -= len(buf)
+                    total += len(buf)
+        if total == 0:
+            raise ApiError(400, "Request body is empty.")
+        return total
+
+    def handle_expect_100(self):
+        # Refuse before the client starts streaming a body we would only reject
+        if self.command == "POST" and urlsplit(self.path).path in TOOLS and self.server.is_busy():
+            self.server.metrics.add_rejected()
+            self.close_connection = True
+            self._send_json(503, {"error": "Server busy, retry later."})
+            return False
+        return super().handle_expect_100()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/healthz":
+            self._send_json(200, {
+                "status": "ok",
+                "in_flight": self.server.metrics.in_flight,
+                "max_concurrency": self.server.max_concurrency,
+                "features": {
+                    "opencv": HAS_CV2,
+                    "mediapipe": HAS_MEDIAPIPE,
+                    "pdf2image": HAS_PDF2IMAGE,
+                    "pdf2docx": HAS_PDF2DOCX,
+                },
+            })
+        elif path == "/metrics":
+            body = self.server.metrics.render(self.server.max_concurrency).encode("utf-8")
+            self._send_bytes(200, body, "text/plain; version=0.0.4")
+        elif path == "/":
+            self._send_json(200, {"tools": sorted(TOOLS)})
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        tool = TOOLS.get(url.path)
+        if tool is None:
+            self.close_connection = True
+            self._send_json(404, {"error": "Not found."})
+            return
+
+        metrics = self.server.metrics
+        started = time.monotonic()
+        status, bytes_in, bytes_out = 200, 0, 0
+        self._headers_sent = False
+        workdir = tempfile.mkdtemp(prefix="docmint_api_")
+        try:
+            # Spool the upload before taking a slot so slow clients only tie up their own thread
+            src = _spool_path(workdir, "upload")
+            bytes_in = self._receive_body(src)
+
+            # Shed load instead of queueing: the load balancer retries elsewhere
+            if not self.server.slots.acquire(blocking=False):
+                metrics.add_rejected()
+                raise ApiError(503, "Server busy, retry later.")
+            metrics.add_in_flight(1)
+            try:
+                out, content_type, filename = tool(src, parse_qs(url.query), workdir, self.server.max_upload_bytes)
+            finally:
+                # Sending the result is I/O, not processing; free the slot for the next job
+                metrics.add_in_flight(-1)
+                self.server.slots.release()
+
+            bytes_out = self._send_file(out, content_type, filename)
+        except ApiError as e:
+            status = e.status
+            # Body may be partially unread; don't reuse the connection
+            self.close_connection = True
+            if not self._headers_sent:
+                self._send_json(status, {"error": e.message})
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            status = 499
+            self.close_connection = True
+        except Exception as e:
+            status = 500
+            self.close_connection = True
+            self.log_error("%s failed: %r", url.path, e)
+            # A half-sent response can't be replaced; closing tells the client it's incomplete
+            if not self._headers_sent:
+                self._send_json(status, {"error": "Internal server error."})
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+            metrics.observe(url.path, status, time.monotonic() - started, bytes_in, bytes_out)
+
+
+class DocMintServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, max_concurrency, max_upload_mb,
+                 read_timeout=DEFAULT_READ_TIMEOUT, upload_deadline=DEFAULT_UPLOAD_DEADLINE):
+        super().__init__(address, DocMintHandler)
+        self.max_concurrency = max_concurrency
+        self.max_upload_bytes = max_upload_mb * 1024 * 1024
+        self.read_timeout = read_timeout
+        self.upload_deadline = upload_deadline
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.metrics = Metrics()
+
+    def is_busy(self):
+        if not self.slots.acquire(blocking=False):
+            return True
+        self.slots.release()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DocMint HTTP API server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Jobs processed at once; extra requests get 503")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB)
+    parser.add_argument("--read-timeout", type=float, default=DEFAULT_READ_TIMEOUT,
+                        help="Seconds a client may stay silent before the connection is dropped")
+    parser.add_argument("--upload-deadline", type=float, default=DEFAULT_UPLOAD_DEADLINE,
+                        help="Seconds allowed to receive a whole request body")
+    args = parser.parse_args(argv)
+
+    server = DocMintServer((args.host, args.port), max(args.max_concurrency, 1), args.max_upload_mb,
+                           args.read_timeout, args.upload_deadline)
+    print(f"DocMint API listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
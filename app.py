@@ -7,17 +7,16 @@ import base64
 import platform
 import tempfile
 import shutil
-import numpy as np
 
 # --- LIBRARIES IMPORT & CHECKS ---
 
-# 1. PDF Libraries
-from PyPDF2 import PdfReader, PdfWriter
-try:
-    from pdf2docx import Converter
-    HAS_PDF2DOCX = True
-except ImportError:
-    HAS_PDF2DOCX = False
+# 1. Tool core shared with the HTTP API (PDF, OpenCV/MediaPipe and Poppler checks)
+from docmint_tools import (
+    HAS_CV2, HAS_MEDIAPIPE, HAS_PDF2DOCX, HAS_PDF2IMAGE,
+    output_format, save_image, compress_image, resize_image, upscale_image, crop_image,
+    rotate_image, convert_image, load_rgb_array, blur_image, remove_background,
+    merge_pdfs, split_pdf, pdf_to_docx, pdf_to_jpgs,
+)
 
 try:
     from reportlab.pdfgen import canvas
@@ -40,22 +39,8 @@ try:
 except ImportError:
     HAS_IMGKIT = False
 
-# 4. Advanced Image Libraries (MediaPipe & OpenCV)
-try:
-    import cv2
-    import mediapipe as mp
-    HAS_CV2_MEDIAPIPE = True
-except ImportError:
-    HAS_CV2_MEDIAPIPE = False
-
-# 5. PDF to Image
-try:
-    from pdf2image import convert_from_bytes
-    HAS_PDF2IMAGE = True
-except ImportError:
-    HAS_PDF2IMAGE = False
-except Exception:
-    HAS_PDF2IMAGE = False
+# 4. Images to PDF (streaming, JPEG passthrough)
+from jpg_to_pdf import images_to_pdf, PAGE_SIZES, FIT_MODES, ORIENTATIONS
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -272,18 +257,8 @@ def tool_compress_image():
         target_kb = c2.number_input("Target Size (KB)", min_value=10, max_value=int(current_kb) if current_kb > 10 else 100, value=int(current_kb*0.7))
         
         if st.button("Compress Now", type="primary"):
-            # Reuse logic
-            target_bytes = target_kb * 1024
             buf = BytesIO()
-            img = img.convert("RGB")
-            img.save(buf, format="JPEG", quality=85, optimize=True)
-            
-            # Simple recursive quality reduction
-            qual = 85
-            while buf.tell() > target_bytes and qual > 10:
-                buf = BytesIO()
-                qual -= 5
-                img.save(buf, format="JPEG", quality=qual, optimize=True)
+            qual = compress_image(img, target_kb * 1024, buf)
             
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.success(f"Compressed to {buf.tell()/1024:.1f} KB (Quality: {qual})")
@@ -307,10 +282,9 @@ def tool_resize_image():
             h = c2.number_input("Height", value=img.height)
             
         if st.button("Resize", type="primary"):
-            res = img.resize((w, h), Image.Resampling.LANCZOS)
             b = BytesIO()
-            fmt = img.format if img.format else "PNG"
-            res.save(b, format=fmt)
+            fmt = output_format(img)
+            save_image(resize_image(img, w, h), b, fmt)
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.download_button("Download", b.getvalue(), f"resized.{fmt.lower()}", f"image/{fmt.lower()}", type="primary")
             st.markdown('</div>', unsafe_allow_html=True)
@@ -332,17 +306,15 @@ def tool_crop_image():
         bottom = c2.slider("Bottom", 0, h//2, 0)
         
         if st.button("Crop Image", type="primary"):
-            # crop box: (left, top, right, bottom)
-            # PIL right/bottom are coordinates, not margins
-            box = (left, top, w - right, h - bottom)
-            cropped = img.crop(box)
+            cropped = crop_image(img, left, top, right, bottom)
+            fmt = output_format(img)
             
             b = BytesIO()
-            cropped.save(b, format=img.format if img.format else "PNG")
+            save_image(cropped, b, fmt)
             
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.image(cropped, caption="Result")
-            st.download_button("Download Cropped", b.getvalue(), f"cropped.{img.format.lower()}", f"image/{img.format.lower()}", type="primary")
+            st.download_button("Download Cropped", b.getvalue(), f"cropped.{fmt.lower()}", f"image/{fmt.lower()}", type="primary")
             st.markdown('</div>', unsafe_allow_html=True)
 
 def tool_upscale_image():
@@ -356,63 +328,45 @@ def tool_upscale_image():
         fact_int = 2 if factor == "2x" else 4
         
         if st.button("Upscale", type="primary"):
-            new_size = (img.width * fact_int, img.height * fact_int)
-            # Lanczos is best for upscaling among standard PIL filters
-            upscaled = img.resize(new_size, Image.Resampling.LANCZOS)
+            upscaled = upscale_image(img, fact_int)
+            new_size = upscaled.size
+            fmt = output_format(img)
             
             b = BytesIO()
-            upscaled.save(b, format=img.format if img.format else "PNG")
+            save_image(upscaled, b, fmt)
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.success(f"Upscaled to {new_size[0]}x{new_size[1]}")
-            st.download_button("Download", b.getvalue(), f"upscaled_{factor}.{img.format.lower()}", f"image/{img.format.lower()}", type="primary")
+            st.download_button("Download", b.getvalue(), f"upscaled_{factor}.{fmt.lower()}", f"image/{fmt.lower()}", type="primary")
             st.markdown('</div>', unsafe_allow_html=True)
 
 def tool_remove_bg():
     st.markdown("### Remove background (MediaPipe)")
     st.caption("Powered by Google MediaPipe. Best for portraits/people.")
     
-    if not HAS_CV2_MEDIAPIPE:
+    if not (HAS_CV2 and HAS_MEDIAPIPE):
         st.error("Libraries `mediapipe` or `opencv` missing. Install: `pip install mediapipe opencv-python-headless`")
         return
 
     uploaded = st.file_uploader("Upload Image", type=["png", "jpg", "jpeg"])
     if uploaded:
-        # Convert uploaded file to OpenCV format
-        file_bytes = np.asarray(bytearray(uploaded.read()), dtype=np.uint8)
-        image = cv2.imdecode(file_bytes, 1) # BGR
+        image_rgb = load_rgb_array(uploaded)
+        if image_rgb is None:
+            st.error("Could not read this image.")
+            return
         
-        st.image(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), caption="Original", width=200)
+        st.image(image_rgb, caption="Original", width=200)
         
         if st.button("Remove Background", type="primary"):
             with st.spinner("Processing with MediaPipe..."):
-                mp_selfie_segmentation = mp.solutions.selfie_segmentation
+                final_pil = remove_background(image_rgb)
+                
+                b = BytesIO()
+                final_pil.save(b, format="PNG")
                 
-                # Using Selfie Segmentation model
-                with mp_selfie_segmentation.SelfieSegmentation(model_selection=1) as selfie_segmentation:
-                    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                    results = selfie_segmentation.process(image_rgb)
-                    
-                    # Generate mask (0.0 to 1.0)
-                    mask = results.segmentation_mask
-                    condition = mask > 0.5 # Threshold
-                    
-                    # Create RGBA Image
-                    # Convert original to BGRA (adds alpha channel)
-                    image_bgra = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
-                    
-                    # Where condition is FALSE (background), set Alpha to 0
-                    image_bgra[:, :, 3] = np.where(condition, 255, 0).astype(np.uint8)
-                    
-                    # Convert back to PIL for display/download
-                    final_pil = Image.fromarray(cv2.cvtColor(image_bgra, cv2.COLOR_BGRA2RGBA))
-                    
-                    b = BytesIO()
-                    final_pil.save(b, format="PNG")
-                    
-                    st.markdown('<div class="result-box">', unsafe_allow_html=True)
-                    st.image(final_pil, caption="Background Removed", width=200)
-                    st.download_button("Download PNG", b.getvalue(), "no_bg_mp.png", "image/png", type="primary")
-                    st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown('<div class="result-box">', unsafe_allow_html=True)
+                st.image(final_pil, caption="Background Removed", width=200)
+                st.download_button("Download PNG", b.getvalue(), "no_bg_mp.png", "image/png", type="primary")
+                st.markdown('</div>', unsafe_allow_html=True)
 
 def tool_photo_editor():
     st.markdown("### Photo editor")
@@ -515,8 +469,7 @@ def tool_rotate_image():
     if uploaded:
         angle = st.slider("Angle", -180, 180, 0)
         if st.button("Rotate", type="primary"):
-            img = Image.open(uploaded)
-            res = img.rotate(-angle, expand=True) # Negative to make clockwise intuitive
+            res = rotate_image(Image.open(uploaded), angle)
             b = BytesIO()
             res.save(b, format="PNG")
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
@@ -526,7 +479,7 @@ def tool_rotate_image():
 
 def tool_blur_face():
     st.markdown("### Blur Face / Privacy Blur")
-    if not HAS_CV2_MEDIAPIPE:
+    if not HAS_CV2:
         st.error("OpenCV (`opencv-python-headless`) is required.")
         return
 
@@ -534,27 +487,14 @@ def tool_blur_face():
     mode = st.radio("Mode", ["Auto Detect Face", "Blur Whole Image"], horizontal=True)
     
     if uploaded and st.button("Process", type="primary"):
-        file_bytes = np.asarray(bytearray(uploaded.read()), dtype=np.uint8)
-        img = cv2.imdecode(file_bytes, 1)
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB) # Streamlit uses RGB
+        img = load_rgb_array(uploaded) # Streamlit uses RGB
+        if img is None:
+            st.error("Could not read this image.")
+            return
         
-        if mode == "Blur Whole Image":
-            img = cv2.GaussianBlur(img, (99, 99), 30)
-        else:
-            # Auto Face
-            # Load cascade from cv2 data
-            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            face_cascade = cv2.CascadeClassifier(cascade_path)
-            gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-            
-            if len(faces) == 0:
-                st.warning("No faces detected. Try 'Blur Whole Image'.")
-            
-            for (x, y, w, h) in faces:
-                ROI = img[y:y+h, x:x+w]
-                blur = cv2.GaussianBlur(ROI, (51, 51), 30)
-                img[y:y+h, x:x+w] = blur
+        img, faces = blur_image(img, "whole" if mode == "Blur Whole Image" else "face")
+        if mode != "Blur Whole Image" and faces == 0:
+            st.warning("No faces detected. Try 'Blur Whole Image'.")
 
         pil_img = Image.fromarray(img)
         b = BytesIO()
@@ -590,10 +530,8 @@ def tool_merge_pdf():
     st.markdown("### Merge PDFs")
     files = st.file_uploader("Select PDFs", type="pdf", accept_multiple_files=True)
     if files and st.button("Merge", type="primary"):
-        m = PdfWriter()
-        for f in files: m.append(f)
         o = BytesIO()
-        m.write(o)
+        merge_pdfs(files, o)
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
         st.download_button("Download Merged", o.getvalue(), "merged.pdf", "application/pdf", type="primary")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -602,13 +540,10 @@ def tool_split_pdf():
     st.markdown("### Split PDF")
     f = st.file_uploader("PDF", type="pdf")
     if f and st.button("Split All"):
-        r = PdfReader(f)
         files = {}
-        for i, p in enumerate(r.pages):
-            w = PdfWriter()
-            w.add_page(p)
+        for name, w in split_pdf(f):
             o = BytesIO(); w.write(o)
-            files[f"p_{i+1}.pdf"] = o.getvalue()
+            files[name] = o.getvalue()
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
         st.download_button("Download ZIP", create_zip(files, "split.zip"), "split.zip", "application/zip", type="primary")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -624,9 +559,7 @@ def tool_pdf_to_word():
             tmp.write(f.getvalue()); tmp_path = tmp.name
         docx = tmp_path.replace(".pdf", ".docx")
         try:
-            cv = Converter(tmp_path)
-            cv.convert(docx)
-            cv.close()
+            pdf_to_docx(tmp_path, docx)
             with open(docx, "rb") as d: data = d.read()
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.download_button("Download DOCX", data, "conv.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", type="primary")
@@ -638,25 +571,55 @@ def tool_pdf_to_jpg():
     if not HAS_PDF2IMAGE: st.error("Install `pdf2image` + Poppler"); return
     f = st.file_uploader("PDF", type="pdf")
     if f and st.button("Convert"):
-        imgs = convert_from_bytes(f.getvalue())
         # Just download first page for brevity in this massive script
-        b = BytesIO()
-        imgs[0].save(b, "JPEG")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = os.path.join(tmpdir, "in.pdf")
+            with open(pdf_path, "wb") as tmp: tmp.write(f.getvalue())
+            paths = pdf_to_jpgs(pdf_path, tmpdir, first_page=1, last_page=1)
+            with open(paths[0], "rb") as page: data = page.read()
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
-        st.download_button("Download JPG (Page 1)", b.getvalue(), "page1.jpg", "image/jpeg", type="primary")
+        st.download_button("Download JPG (Page 1)", data, "page1.jpg", "image/jpeg", type="primary")
         st.markdown('</div>', unsafe_allow_html=True)
 
 def tool_img_convert(to_fmt):
     st.markdown(f"### Convert to {to_fmt}")
     u = st.file_uploader("Image", type=["png", "jpg", "webp", "tiff"])
     if u and st.button("Convert"):
-        i = Image.open(u).convert("RGB")
         b = BytesIO()
-        i.save(b, to_fmt)
+        convert_image(Image.open(u), b, to_fmt)
         st.markdown('<div class="result-box">', unsafe_allow_html=True)
         st.download_button(f"Download {to_fmt}", b.getvalue(), f"conv.{to_fmt.lower()}", f"image/{to_fmt.lower()}", type="primary")
         st.markdown('</div>', unsafe_allow_html=True)
 
+def tool_jpg_to_pdf():
+    st.markdown("### JPG to PDF")
+    st.caption("Combine photos into one PDF. JPEGs are embedded as-is, without re-encoding.")
+    files = st.file_uploader("Images", type=["jpg", "jpeg", "png", "webp"], accept_multiple_files=True)
+    if files:
+        c1, c2 = st.columns(2)
+        page_size = c1.selectbox("Page Size", list(PAGE_SIZES))
+        orientation = c2.selectbox("Orientation", ORIENTATIONS, format_func=str.capitalize)
+        fit = c1.radio("Image Fit", FIT_MODES, horizontal=True,
+                       format_func=lambda f: "Fit (whole image)" if f == "fit" else "Fill (crop to page)")
+        margin_mm = c2.number_input("Margin (mm)", min_value=0, max_value=50, value=0)
+        max_px = st.number_input("Downscale longest edge to (px, 0 = keep original)", min_value=0, max_value=20000, value=0, step=100)
+
+        if st.button("Create PDF", type="primary"):
+            # Pages are written one by one; only the finished PDF is read back for download
+            out = tempfile.SpooledTemporaryFile(max_size=32 * 1024 * 1024)
+            try:
+                with st.spinner(f"Adding {len(files)} images..."):
+                    pages = images_to_pdf(files, out, page_size=page_size, fit=fit, orientation=orientation,
+                                          margin=margin_mm * 72 / 25.4, max_px=max_px or None)
+                size = out.tell()
+                out.seek(0)
+                st.markdown('<div class="result-box">', unsafe_allow_html=True)
+                st.success(f"Created {pages} pages ({get_size_format(size)})")
+                st.download_button("Download PDF", out.read(), "images.pdf", "application/pdf", type="primary")
+                st.markdown('</div>', unsafe_allow_html=True)
+            except Exception as e: st.error(e)
+            finally: out.close()
+
 # --- ROUTING ---
 tool = render_sidebar()
 
@@ -680,7 +643,7 @@ elif tool == "Watermark PDF": st.info("Use previous code snippet for PDF Waterma
 
 # Converter Routing
 elif tool == "Convert to JPG": tool_img_convert("JPEG")
-elif tool == "Convert from JPG": tool_img_convert("PNG")
+elif tool == "Convert from JPG": tool_jpg_to_pdf()
 elif tool == "HTML to IMAGE": tool_html_to_image()
 else: st.info("This tool is ready in the backend, just navigate to it!")
 
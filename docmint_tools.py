@@ -0,0 +1,144 @@
+"""Core DocMint tools, shared by the Streamlit UI (app.py) and the HTTP API (api.py).
+
+Nothing here knows about Streamlit or HTTP: tools take PIL images, RGB
+numpy arrays, paths or binary file objects, and errors from the underlying
+libraries are left for the caller to report.
+"""
+import os
+
+import numpy as np
+from PIL import Image
+
+# --- LIBRARIES IMPORT & CHECKS ---
+
+from PyPDF2 import PdfReader, PdfWriter
+try:
+    from pdf2docx import Converter
+    HAS_PDF2DOCX = True
+except ImportError:
+    HAS_PDF2DOCX = False
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+try:
+    import mediapipe as mp
+    HAS_MEDIAPIPE = True
+except ImportError:
+    HAS_MEDIAPIPE = False
+
+try:
+    from pdf2image import convert_from_path
+    HAS_PDF2IMAGE = True
+except ImportError:
+    HAS_PDF2IMAGE = False
+except Exception:
+    HAS_PDF2IMAGE = False
+
+BLUR_MODES = ["face", "whole"]
+
+# --- IMAGE TOOLS ---
+
+def output_format(img):
+    # Keep the uploaded format where Pillow knows it
+    return img.format if img.format else "PNG"
+
+def save_image(img, out, fmt):
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    img.save(out, format=fmt)
+
+def compress_image(img, target_bytes, out):
+    """Write ``img`` as JPEG to the binary file ``out``, lowering quality until it fits.
+
+    Returns the JPEG quality used.
+    """
+    img = img.convert("RGB")
+    qual = 85
+    while True:
+        out.seek(0)
+        out.truncate()
+        img.save(out, format="JPEG", quality=qual, optimize=True)
+        if out.tell() <= target_bytes or qual <= 10:
+            return qual
+        qual -= 5
+
+def resize_image(img, width, height):
+    return img.resize((max(int(width), 1), max(int(height), 1)), Image.Resampling.LANCZOS)
+
+def upscale_image(img, factor):
+    # Lanczos is best for upscaling among standard PIL filters
+    return img.resize((img.width * factor, img.height * factor), Image.Resampling.LANCZOS)
+
+def crop_image(img, left, top, right, bottom):
+    # Arguments are margins; PIL's crop box wants right/bottom coordinates
+    return img.crop((left, top, img.width - right, img.height - bottom))
+
+def rotate_image(img, angle):
+    return img.rotate(-angle, expand=True) # Negative to make clockwise intuitive
+
+def convert_image(img, out, fmt):
+    img.convert("RGB").save(out, fmt)
+
+def load_rgb_array(src):
+    """Decode a path or binary file object into an RGB array, or None if unreadable."""
+    if isinstance(src, (str, os.PathLike)):
+        data = np.fromfile(src, dtype=np.uint8)
+    else:
+        data = np.frombuffer(src.read(), dtype=np.uint8)
+    img = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+    return None if img is None else cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+def blur_image(rgb, mode="face"):
+    """Blur detected faces (or the whole image); returns (RGB array, faces found)."""
+    if mode == "whole":
+        return cv2.GaussianBlur(rgb, (99, 99), 30), 0
+
+    cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+    face_cascade = cv2.CascadeClassifier(cascade_path)
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+    for (x, y, w, h) in faces:
+        rgb[y:y+h, x:x+w] = cv2.GaussianBlur(rgb[y:y+h, x:x+w], (51, 51), 30)
+    return rgb, len(faces)
+
+def remove_background(rgb):
+    """Return an RGBA PIL image with the background made transparent (MediaPipe)."""
+    with mp.solutions.selfie_segmentation.SelfieSegmentation(model_selection=1) as selfie_segmentation:
+        results = selfie_segmentation.process(rgb)
+
+    # Where the mask is background (<= 0.5), set Alpha to 0
+    rgba = np.dstack([rgb, np.where(results.segmentation_mask > 0.5, 255, 0).astype(np.uint8)])
+    return Image.fromarray(rgba, "RGBA")
+
+# --- PDF TOOLS ---
+
+def merge_pdfs(sources, out):
+    # sources: paths, binary files or PdfReaders, merged in order
+    m = PdfWriter()
+    for src in sources:
+        m.append(src)
+    m.write(out)
+
+def split_pdf(src):
+    """Yield (filename, PdfWriter) for every page of ``src``."""
+    r = src if isinstance(src, PdfReader) else PdfReader(src)
+    for i, p in enumerate(r.pages):
+        w = PdfWriter()
+        w.add_page(p)
+        yield f"p_{i+1}.pdf", w
+
+def pdf_to_docx(pdf_path, docx_path):
+    cv = Converter(pdf_path)
+    try:
+        cv.convert(docx_path)
+    finally:
+        cv.close()
+
+def pdf_to_jpgs(pdf_path, output_folder, dpi=200, first_page=None, last_page=None):
+    # Poppler renders straight to disk; only paths come back
+    return convert_from_path(pdf_path, dpi=dpi, fmt="jpeg", output_folder=output_folder,
+                             first_page=first_page, last_page=last_page, paths_only=True)
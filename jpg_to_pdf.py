@@ -0,0 +1,290 @@
+"""Streaming images-to-PDF assembly.
+
+JPEG files are embedded into the PDF as-is (``/DCTDecode``), so the pixels
+are never decoded or re-encoded. Each page is written to the output file as
+soon as it is added and only object offsets are kept in memory, so memory
+stays flat no matter how many images go into one PDF.
+
+Other formats (PNG, WebP, ...) and images that need downscaling go through
+Pillow once and are embedded as freshly encoded JPEG.
+
+    with open("album.pdf", "wb") as out:
+        images_to_pdf(["a.jpg", "b.jpg"], out, page_size="A4", margin=18)
+"""
+import os
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+# Page sizes in PDF points (1/72 inch)
+PAGE_SIZES = {
+    "A4": (595.2756, 841.8898),
+    "Letter": (612.0, 792.0),
+    "Fit to image": None,
+}
+FIT_MODES = ["fit", "fill"]
+ORIENTATIONS = ["auto", "portrait", "landscape"]
+
+DEFAULT_DPI = 96
+CHUNK_SIZE = 64 * 1024
+
+# EXIF orientation -> matrix placing the stored image in the unit square upright
+_EXIF_MATRICES = {
+    1: (1, 0, 0, 1, 0, 0),
+    2: (-1, 0, 0, 1, 1, 0),
+    3: (-1, 0, 0, -1, 1, 1),
+    4: (1, 0, 0, -1, 0, 1),
+    5: (0, -1, -1, 0, 1, 1),
+    6: (0, -1, 1, 0, 0, 1),
+    7: (0, 1, 1, 0, 0, 0),
+    8: (0, 1, -1, 0, 1, 0),
+}
+_COLORSPACES = {"L": "/DeviceGray", "RGB": "/DeviceRGB", "CMYK": "/DeviceCMYK"}
+
+
+def _num(v):
+    s = f"{v:.4f}".rstrip("0").rstrip(".")
+    return s if s not in ("", "-0") else "0"
+
+def _source_size(src):
+    if isinstance(src, (str, os.PathLike)):
+        return os.path.getsize(src)
+    src.seek(0, os.SEEK_END)
+    return src.tell()
+
+def _iter_chunks(f, remaining):
+    f.seek(0)
+    while remaining > 0:
+        buf = f.read(min(CHUNK_SIZE, remaining))
+        if not buf:
+            break
+        remaining -= len(buf)
+        yield buf
+
+def _read_chunks(src, length):
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "rb") as f:
+            yield from _iter_chunks(f, length)
+    else:
+        yield from _iter_chunks(src, length)
+
+def _first_frame_size(img):
+    # MPO (multi-picture JPEG: phone HDR gain maps, depth maps) puts the primary
+    # image first; its MP entry gives the byte length to embed
+    try:
+        entry = img.mpinfo[0xB002][0]
+        return entry["Size"] if entry["DataOffset"] == 0 and entry["Size"] > 0 else None
+    except (AttributeError, KeyError, IndexError, TypeError):
+        return None
+
+
+class UnreadableImageError(ValueError):
+    """An input could not be opened or decoded as an image."""
+
+
+class PdfImageWriter:
+    """Writes one image per page straight to a binary file object."""
+
+    def __init__(self, out, page_size="A4", fit="fit", margin=0.0, orientation="auto",
+                 max_px=None, quality=85):
+        if page_size not in PAGE_SIZES:
+            raise ValueError(f"page_size must be one of {list(PAGE_SIZES)}")
+        if fit not in FIT_MODES:
+            raise ValueError(f"fit must be one of {FIT_MODES}")
+        if orientation not in ORIENTATIONS:
+            raise ValueError(f"orientation must be one of {ORIENTATIONS}")
+        self.out = out
+        self.page_size = PAGE_SIZES[page_size]
+        self.fit = fit
+        self.margin = max(float(margin), 0.0)
+        self.orientation = orientation
+        self.max_px = max_px or None
+        self.quality = quality
+
+        # Objects 1 and 2 (catalog, page tree) are written last in close()
+        self._offsets = {}
+        self._next_id = 3
+        self._page_ids = []
+        self._closed = False
+        self._pos = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+    @property
+    def page_count(self):
+        return len(self._page_ids)
+
+    def _write(self, data):
+        self.out.write(data)
+        self._pos += len(data)
+
+    def _new_id(self):
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _begin_obj(self, obj_id):
+        self._offsets[obj_id] = self._pos
+        self._write(f"{obj_id} 0 obj\n".encode("ascii"))
+
+    def _write_obj(self, obj_id, body):
+        self._begin_obj(obj_id)
+        self._write(body.encode("ascii") + b"\nendobj\n")
+
+    def _prepare(self, src):
+        """Return (width, height, mode, exif orientation, dpi, jpeg bytes or None, adobe, frame size).
+
+        jpeg bytes is None when the source can be copied through untouched;
+        frame size then limits the copy to an MPO's primary image.
+        """
+        try:
+            img = Image.open(src)
+        except Image.UnidentifiedImageError as e:
+            raise UnreadableImageError(str(e)) from e
+        try:
+            dpi = img.info.get("dpi", (DEFAULT_DPI, DEFAULT_DPI))
+            dpi = tuple(float(d) if d and d > 1 else DEFAULT_DPI for d in dpi[:2])
+            too_big = self.max_px and max(img.size) > self.max_px
+            if img.format in ("JPEG", "MPO") and img.mode in _COLORSPACES and not too_big:
+                orientation = img.getexif().get(0x0112, 1)
+                if orientation not in _EXIF_MATRICES:
+                    orientation = 1
+                frame = _first_frame_size(img) if img.format == "MPO" else None
+                return img.width, img.height, img.mode, orientation, dpi, None, "adobe" in img.info, frame
+
+            # Decode path: only one image is held in memory at a time
+            orig_w, orig_h = img.size
+            if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+                orig_w, orig_h, dpi = orig_h, orig_w, (dpi[1], dpi[0])
+            if too_big and img.format in ("JPEG", "MPO"):
+                img.draft("RGB", (self.max_px, self.max_px))
+            img = ImageOps.exif_transpose(img)
+            if img.mode in ("RGBA", "LA", "P"):
+                img = img.convert("RGBA")
+                bg = Image.new("RGB", img.size, (255, 255, 255))
+                bg.paste(img, mask=img.getchannel("A"))
+                img = bg
+            elif img.mode not in ("L", "RGB"):
+                img = img.convert("RGB")
+            if too_big:
+                img.thumbnail((self.max_px, self.max_px), Image.Resampling.LANCZOS)
+                # Keep the physical size when the pixel count changes
+                dpi = (dpi[0] * img.width / orig_w, dpi[1] * img.height / orig_h)
+            buf = BytesIO()
+            img.save(buf, format="JPEG", quality=self.quality, optimize=True)
+            return img.width, img.height, img.mode, 1, dpi, buf.getvalue(), False, None
+        except (OSError, SyntaxError) as e:
+            # Pillow reports truncated or corrupt image data this way
+            raise UnreadableImageError(str(e)) from e
+        finally:
+            # Closing would also close a caller's file object still needed for the raw copy
+            if isinstance(src, (str, os.PathLike)):
+                img.close()
+
+    def _layout(self, disp_w, disp_h, dpi):
+        """Return (page_w, page_h, x, y, w, h) for an image shown at disp_w x disp_h px."""
+        m = self.margin
+        if self.page_size is None:
+            w, h = disp_w * 72.0 / dpi[0], disp_h * 72.0 / dpi[1]
+            return w + 2 * m, h + 2 * m, m, m, w, h
+
+        page_w, page_h = self.page_size
+        if self.orientation == "landscape" or (self.orientation == "auto" and disp_w > disp_h):
+            page_w, page_h = page_h, page_w
+        box_w, box_h = max(page_w - 2 * m, 1.0), max(page_h - 2 * m, 1.0)
+        if self.fit == "fit":
+            scale = min(box_w / disp_w, box_h / disp_h)
+        else:
+            scale = max(box_w / disp_w, box_h / disp_h)
+        w, h = disp_w * scale, disp_h * scale
+        return page_w, page_h, m + (box_w - w) / 2, m + (box_h - h) / 2, w, h
+
+    def add_image(self, src):
+        """Append one page holding ``src`` (a path or a seekable binary file)."""
+        if self._closed:
+            raise ValueError("writer is closed")
+        width, height, mode, orientation, dpi, data, adobe, frame = self._prepare(src)
+        if orientation in (5, 6, 7, 8):
+            disp_w, disp_h, dpi = height, width, (dpi[1], dpi[0])
+        else:
+            disp_w, disp_h = width, height
+        page_w, page_h, x, y, w, h = self._layout(disp_w, disp_h, dpi)
+
+        img_id, content_id, page_id = self._new_id(), self._new_id(), self._new_id()
+
+        # Image XObject: the JPEG stream is copied byte-for-byte
+        if data is not None:
+            length = len(data)
+        else:
+            length = _source_size(src)
+            length = min(frame, length) if frame else length
+        decode = " /Decode [1 0 1 0 1 0 1 0]" if mode == "CMYK" and adobe else ""
+        self._begin_obj(img_id)
+        self._write((f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height}"
+                     f" /ColorSpace {_COLORSPACES[mode]} /BitsPerComponent 8{decode}"
+                     f" /Filter /DCTDecode /Length {length} >>\nstream\n").encode("ascii"))
+        if data is not None:
+            self._write(data)
+        else:
+            start = self._pos
+            for chunk in _read_chunks(src, length):
+                self._write(chunk)
+            if self._pos - start != length:
+                raise ValueError("image changed size while being written")
+        self._write(b"\nendstream\nendobj\n")
+
+        # Page content: clip to the margin box (matters for "fill"), place, orient
+        ops = ["q"]
+        if self.fit == "fill" and self.page_size is not None:
+            m = self.margin
+            ops.append(f"{_num(m)} {_num(m)} {_num(page_w - 2 * m)} {_num(page_h - 2 * m)} re W n")
+        ops.append(f"{_num(w)} 0 0 {_num(h)} {_num(x)} {_num(y)} cm")
+        if orientation != 1:
+            ops.append(" ".join(str(v) for v in _EXIF_MATRICES[orientation]) + " cm")
+        ops += ["/Im0 Do", "Q"]
+        content = "\n".join(ops).encode("ascii")
+        self._begin_obj(content_id)
+        self._write(f"<< /Length {len(content)} >>\nstream\n".encode("ascii") + content
+                    + b"\nendstream\nendobj\n")
+
+        self._write_obj(page_id, (f"<< /Type /Page /Parent 2 0 R"
+                                  f" /MediaBox [0 0 {_num(page_w)} {_num(page_h)}]"
+                                  f" /Resources << /XObject << /Im0 {img_id} 0 R >> >>"
+                                  f" /Contents {content_id} 0 R >>"))
+        self._page_ids.append(page_id)
+
+    def close(self):
+        """Write the page tree, catalog, xref table and trailer."""
+        if self._closed:
+            return
+        if not self._page_ids:
+            raise ValueError("no images were added")
+        self._closed = True
+        kids = " ".join(f"{p} 0 R" for p in self._page_ids)
+        self._write_obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>")
+        self._write_obj(1, "<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_pos = self._pos
+        size = self._next_id
+        rows = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        rows += [f"{self._offsets[i]:010d} 00000 n \n" for i in range(1, size)]
+        self._write("".join(rows).encode("ascii"))
+        self._write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_pos}\n%%EOF\n"
+                    .encode("ascii"))
+
+
+def images_to_pdf(sources, out, **options):
+    """Write every image in ``sources`` as one page of a PDF into ``out``.
+
+    ``options`` are passed to :class:`PdfImageWriter`. Returns the page count.
+    """
+    with PdfImageWriter(out, **options) as writer:
+        for src in sources:
+            writer.add_image(src)
+    return writer.page_count